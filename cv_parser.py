@@ -1,15 +1,44 @@
 import fitz  # PyMuPDF
-import pytesseract
-from PIL import Image
-import io
+from PIL import Image, ImageFilter, ImageOps
 import re
 import os
-import cv2
+import contextlib
+import copy
+import importlib.util
+import hashlib
+import json
+import multiprocessing
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
 import numpy as np
-from difflib import get_close_matches
+from rapidfuzz import fuzz, process
+from collections import deque
+from functools import lru_cache
 
-# Configure Tesseract path if needed
-pytesseract.pytesseract.tesseract_cmd = r'C:\Program Files\Tesseract-OCR\tesseract.exe'
+# Configure Tesseract language data path if needed
+TESSDATA_PATH = r'C:\Program Files\Tesseract-OCR\tessdata'
+
+# Tesseract already scales to ~4 threads per page, so run one OCR process per 4 cores
+OCR_WORKERS = max(1, (os.cpu_count() or 1) // 4)
+_worker_engine = None
+
+# Parsed CVs hold personal data, so they are cached in a private per-user
+# directory, keyed by the SHA-1 of the file contents
+CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "cv_parser")
+# Bump whenever parsing changes so results from older code are not served
+CACHE_VERSION = 1
+# Only the most recently written entries are kept
+CACHE_MAX_ENTRIES = 256
+
+# OpenCV is optional: without it every image goes through the Pillow pipeline
+_USE_OPENCV = importlib.util.find_spec("cv2") is not None
+# Uploaded images up to this size (about A4 at 200 dpi) are preprocessed with Pillow
+PIL_PREPROCESS_MAX_PIXELS = 4_000_000
+_BINARY_LUT = [0] * 129 + [255] * 127
+
+# Scanned pages are rendered in grayscale at this resolution for OCR
+OCR_DPI = 300
+OCR_MATRIX = fitz.Matrix(OCR_DPI / 72, OCR_DPI / 72)
 
 # Standard CV sections to look for
 STANDARD_SECTIONS = [
@@ -27,40 +56,181 @@ STANDARD_SECTIONS = [
     "PUBLICATIONS", "RESEARCH PAPERS",
     "REFERENCES"
 ]
+_STANDARD_SECTION_SET = frozenset(STANDARD_SECTIONS)
+
+# Known skills recognised anywhere in a skills section
+COMMON_SKILLS = [
+    "Python", "Java", "JavaScript", "TypeScript", "C++", "C#", "Rust", "PHP", "Ruby",
+    "Kotlin", "Swift", "Scala", "MATLAB", "Bash",
+    "HTML", "CSS", "SQL", "NoSQL", "MySQL", "PostgreSQL", "MongoDB", "Oracle", "Redis",
+    "React", "Angular", "Vue.js", "Node.js", "Express.js", "Django", "Flask", "FastAPI",
+    "Spring", "Spring Boot", "Laravel", ".NET", "Flutter",
+    "Docker", "Kubernetes", "Git", "Linux", "Jenkins", "CI/CD", "AWS", "Azure", "Google Cloud",
+    "Machine Learning", "Deep Learning", "NLP", "Computer Vision", "Data Analysis", "Data Science",
+    "TensorFlow", "PyTorch", "Keras", "scikit-learn", "Pandas", "NumPy", "OpenCV",
+    "Power BI", "Tableau", "Excel",
+    "Agile", "Scrum", "REST", "GraphQL", "UML", "Figma",
+    "Communication", "Teamwork", "Leadership", "Problem Solving", "Time Management",
+    "Project Management"
+]
+_SKILL_NAMES = {skill.lower(): skill for skill in COMMON_SKILLS}
+# Skills that are also ordinary English or French words ("react quickly", "Spring 2021",
+# "tableau de bord") only count when they make up a whole list item
+_AMBIGUOUS_SKILLS = frozenset([
+    "Java", "Rust", "Ruby", "Swift", "Scala", "Bash", "Oracle", "React", "Angular", "Flask",
+    "Spring", "Flutter", "Docker", "Git", "Jenkins", "Azure", "Pandas", "Tableau", "Excel",
+    "Agile", "Scrum", "REST",
+    "Communication", "Teamwork", "Leadership", "Problem Solving", "Time Management",
+    "Project Management"
+])
+
+# fuzz.ratio is at most 100*2*min(a, b)/(a + b), so headers longer than this
+# can never reach the cutoff against any standard section
+_FUZZY_CUTOFF = 70
+_MAX_FUZZY_HEADER_LEN = int(max(map(len, STANDARD_SECTIONS)) * (200 - _FUZZY_CUTOFF) / _FUZZY_CUTOFF)
+
+# Precompiled patterns used by the line parsers
+_SECTION_SPLIT_RE = re.compile(r'[,•\n]')
+_TITLE_RE = re.compile(r'^[A-Z][a-z]+( [A-Z][a-z]+)*$')
+_DEGREE_RE = re.compile(r'(Bachelor|Master|PhD|B\.Sc|M\.Sc|Diploma|Degree|Licence|Engineering)', re.IGNORECASE)
+_INSTITUTION_RE = re.compile(r'(University|School|College|Institute)', re.IGNORECASE)
+_DATE_RE = re.compile(r'(\d{4})\s?[-–—]\s?(\d{4}|Present)')
+# Email, phone and LinkedIn URL found together in one scan of the contact block.
+# A phone number stays on one line so it cannot swallow digits starting the next one
+_CONTACT_RE = re.compile(r'(?P<email>[\w\.-]+@[\w\.-]+\.\w+)'
+                         r'|(?P<phone>\+?\d(?:[\d\-\(\)]|[^\S\n]){7,}\d)'
+                         r'|(?P<linkedin>linkedin\.com/[^\s]+)', re.I)
+_ADDRESS_RE = re.compile(r'(\d{1,5}\s[\w\s]{3,},\s[\w\s]{3,},\s[A-Z]{2}\s\d{5})')
+_COMPANY_DATE_RE = re.compile(r'^[A-Z][a-zA-Z0-9& ]+,\s[A-Z][a-z]+\s\d{4}\s?[-–—]\s?(\w+\s\d{4}|Present)')
+_SPLIT_RE = re.compile(r',\s|\s[-–—]\s')
+_BULLET_RE = re.compile(r'^•\s')
+# One alternation over the unambiguous skills, longest names first so "Spring Boot" is
+# found as a whole
+_SKILLS_RE = re.compile(
+    r'(?<![\w+#])(?:'
+    + '|'.join(map(re.escape, sorted(
+        (skill for skill in COMMON_SKILLS if skill not in _AMBIGUOUS_SKILLS), key=len, reverse=True)))
+    + r')(?![\w+#])',
+    re.IGNORECASE)
 
 def preprocess_image(img):
-    """Enhance image for better OCR results"""
-    img_cv = np.array(img)
-    gray = cv2.cvtColor(img_cv, cv2.COLOR_BGR2GRAY)
+    """Enhance image (PIL image or NumPy array) for better OCR results"""
+    import cv2  # Imported lazily: native-text PDFs never need OpenCV
+    
+    img_arr = np.asarray(img)
+    if img_arr.ndim == 2:
+        gray = img_arr
+    elif img_arr.shape[2] == 4:
+        gray = cv2.cvtColor(img_arr, cv2.COLOR_RGBA2GRAY)
+    else:
+        gray = cv2.cvtColor(img_arr, cv2.COLOR_RGB2GRAY)
+    
+    # Run the filters on a UMat so OpenCV can use its OpenCL/SIMD backend
+    gray = cv2.UMat(gray)
+    
+    # Edge-preserving denoising before binarization keeps character strokes sharp
+    denoised = cv2.bilateralFilter(gray, 5, 50, 50)
     
     # Apply adaptive thresholding
-    thresh = cv2.adaptiveThreshold(gray, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C,
-                                 cv2.THRESH_BINARY, 11, 2)
+    thresh = cv2.adaptiveThreshold(denoised, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C,
+                                 cv2.THRESH_BINARY, 31, 10)
     
-    # Denoising
-    denoised = cv2.fastNlMeansDenoising(thresh, None, 30, 7, 21)
+    return thresh.get()
+
+def preprocess_image_pil(img):
+    """Lightweight Pillow-only preprocessing, returning a 1-bpp image"""
+    gray = ImageOps.grayscale(img)
+    denoised = gray.filter(ImageFilter.MedianFilter(3))
+    return denoised.point(_BINARY_LUT, mode='1')
+
+def prepare_for_ocr(img):
+    """Preprocess an image into the 1-bpp form handed to Tesseract"""
+    # Small uploaded images don't need OpenCV, which is heavy to load
+    is_pil = isinstance(img, Image.Image)
+    if not _USE_OPENCV or (is_pil and img.width * img.height <= PIL_PREPROCESS_MAX_PIXELS):
+        return preprocess_image_pil(img if is_pil else Image.fromarray(img))
     
-    return denoised
+    processed_img = preprocess_image(img)
+    # A 1-bpp image makes Tesseract skip its own Otsu binarization
+    return Image.fromarray(processed_img).convert('1')
+
+class OCREngine:
+    """Tesseract engine kept open across images to avoid re-initialising it"""
+    
+    def __init__(self):
+        from tesserocr import PyTessBaseAPI, PSM, OEM
+        self.api = PyTessBaseAPI(path=TESSDATA_PATH, psm=PSM.SINGLE_BLOCK, oem=OEM.DEFAULT)
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+    
+    def close(self):
+        self.api.End()
+    
+    def extract_text(self, img):
+        """Extract text from image with enhanced OCR"""
+        self.api.SetImage(prepare_for_ocr(img))
+        return self.api.GetUTF8Text()
 
 def extract_text_from_image(img):
     """Extract text from image with enhanced OCR"""
-    processed_img = preprocess_image(img)
-    custom_config = r'--oem 3 --psm 6'
-    return pytesseract.image_to_string(processed_img, config=custom_config)
+    with OCREngine() as engine:
+        return engine.extract_text(img)
+
+def _init_ocr_worker():
+    """Open the OCR engine reused by every page a worker process handles"""
+    global _worker_engine
+    _worker_engine = OCREngine()
+
+def _extract_text_in_worker(img):
+    """Extract text from image using the worker process's engine"""
+    return _worker_engine.extract_text(img)
+
+def _render_ocr_pages(doc, page_numbers):
+    """Render pages for OCR one at a time; each array is only valid until the next is rendered"""
+    for i in page_numbers:
+        pix = doc[i].get_pixmap(matrix=OCR_MATRIX, colorspace=fitz.csGRAY, alpha=False)
+        # A zero-copy view of the gray samples: pix stays referenced here until the
+        # consumer asks for the next page, which keeps the view valid
+        yield np.frombuffer(pix.samples_mv, dtype=np.uint8).reshape(pix.height, pix.width)
 
 def extract_text_from_pdf(pdf_path):
     """Extract text from PDF with fallback to OCR"""
-    text = ""
     with fitz.open(pdf_path) as doc:
-        for page in doc:
-            page_text = page.get_text()
-            if page_text.strip():
-                text += page_text
-            else:
-                pix = page.get_pixmap()
-                img = Image.open(io.BytesIO(pix.tobytes()))
-                text += extract_text_from_image(img)
-    return text
+        page_texts = [page.get_text("text") for page in doc]
+        ocr_pages = [i for i, page_text in enumerate(page_texts) if not page_text.strip()]
+        
+        # Fully native PDFs (the common case) never load the OCR stack
+        if not ocr_pages:
+            return "".join(page_texts)
+        
+        # OCR all scanned pages, spreading them over worker processes when there are several
+        workers = min(OCR_WORKERS, len(ocr_pages))
+        if workers > 1:
+            ocr_texts = []
+            pending = deque()
+            # Spawn rather than fork: OpenCV/OpenCL state from earlier OCR jobs is not fork-safe
+            with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"),
+                                     initializer=_init_ocr_worker) as executor:
+                for img in _render_ocr_pages(doc, ocr_pages):
+                    # Keep at most two pages per worker in flight so memory doesn't grow with page count
+                    if len(pending) >= 2 * workers:
+                        ocr_texts.append(pending.popleft().result())
+                    # Pages are pickled to the workers later, so they need their own copy of the pixels
+                    pending.append(executor.submit(_extract_text_in_worker, img.copy()))
+                ocr_texts.extend(future.result() for future in pending)
+        else:
+            # Only one rendered page is alive at a time
+            with OCREngine() as engine:
+                ocr_texts = [engine.extract_text(img) for img in _render_ocr_pages(doc, ocr_pages)]
+    
+    for i, page_text in zip(ocr_pages, ocr_texts):
+        page_texts[i] = page_text
+    
+    return "".join(page_texts)
 
 def extract_text_from_image_file(image_path):
     """Extract text from image files"""
@@ -69,16 +239,21 @@ def extract_text_from_image_file(image_path):
 
 def normalize_section_header(header):
     """Match extracted headers to standard sections"""
-    header_upper = header.upper().strip()
-    
+    return _normalize_upper_header(header.upper().strip())
+
+@lru_cache(maxsize=4096)
+def _normalize_upper_header(header_upper):
+    """Match an upper-cased, stripped header to a standard section"""
     # Try exact match first
-    if header_upper in STANDARD_SECTIONS:
+    if header_upper in _STANDARD_SECTION_SET:
         return header_upper
     
-    # Try close matches
-    matches = get_close_matches(header_upper, STANDARD_SECTIONS, n=1, cutoff=0.7)
-    if matches:
-        return matches[0]
+    # Try close matches (skipped for lines too long to ever match)
+    if len(header_upper) <= _MAX_FUZZY_HEADER_LEN:
+        match = process.extractOne(header_upper, STANDARD_SECTIONS, scorer=fuzz.ratio,
+                                   score_cutoff=_FUZZY_CUTOFF)
+        if match:
+            return match[0]
     
     # Special cases
     if "WORK" in header_upper and "HISTORY" in header_upper:
@@ -92,94 +267,92 @@ def normalize_section_header(header):
 
 def identify_sections(text):
     """Identify and extract CV sections"""
-    sections = {}
     current_section = "GENERAL INFORMATION"
-    sections[current_section] = []
+    sections = {current_section: []}
     
-    lines = [line.strip() for line in text.split('\n') if line.strip()]
+    # Strip, upper-case and count the words of each line once (str.split/strip
+    # outrun a MULTILINE regex tokenizer here, so the lines are split in Python)
+    lines = [(line, line.upper(), len(line.split()))
+             for line in map(str.strip, text.split('\n')) if line]
     
-    for line in lines:
+    for line, line_upper, n_words in lines:
         # Check if line could be a section header
         is_header = False
-        normalized_header = normalize_section_header(line)
+        normalized_header = _normalize_upper_header(line_upper)
         
         # Header detection criteria
         if normalized_header:
             is_header = True
-        elif line.isupper() and len(line.split()) <= 5:
+        elif n_words <= 5 and line.isupper():
             is_header = True
-        elif re.match(r'^[A-Z][a-z]+( [A-Z][a-z]+)*$', line) and len(line.split()) <= 4:
+        elif n_words <= 4 and _TITLE_RE.match(line):
             is_header = True
         
         # If header found, start new section
         if is_header:
-            section_name = normalized_header if normalized_header else line.upper()
+            section_name = normalized_header if normalized_header else line_upper
             current_section = section_name
-            if current_section not in sections:
-                sections[current_section] = []
+            # Register the section even if no lines follow it
+            sections.setdefault(current_section, [])
         else:
-            if current_section not in sections:
-                sections[current_section] = []
             sections[current_section].append(line)
     
     return sections
-def extract_education(text):
-    """Extract education details"""
+def extract_education(lines):
+    """Extract education details from the section's lines"""
     education_list = []
-    lines = [line.strip() for line in text.split('\n') if line.strip()]
     
     current_edu = {}
     for line in lines:
         # Detect degree and institution
-        if re.search(r'(Bachelor|Master|PhD|B\.Sc|M\.Sc|Diploma|Degree|Licence|Engineering)', line, re.IGNORECASE):
+        if _DEGREE_RE.search(line):
             if current_edu:
                 education_list.append(current_edu)
                 current_edu = {}
             current_edu["degree"] = line
         
         # Detect university or school name
-        elif re.search(r'(University|School|College|Institute)', line, re.IGNORECASE):
+        elif _INSTITUTION_RE.search(line):
             current_edu["institution"] = line
         
         # Detect date
-        elif re.search(r'(\d{4})\s?[-–—]\s?(\d{4}|Present)', line):
+        elif _DATE_RE.search(line):
             current_edu["date"] = line
     
     if current_edu:
         education_list.append(current_edu)
     
     return education_list
-def extract_languages(text):
-    """Extract languages from text"""
-    languages = re.split(r'[,•\n]', text)
-    return [lang.strip() for lang in languages if lang.strip()]
+def extract_languages(lines):
+    """Extract languages from the section's lines"""
+    languages = (lang.strip() for line in lines for lang in _SECTION_SPLIT_RE.split(line))
+    return [lang for lang in languages if lang]
 
 def extract_structured_data(sections):
     """Extract structured data from categorized sections"""
     structured_data = {}
     
     # Process each section
+    # Section content is already a list of stripped, non-empty lines
     for section, content in sections.items():
-        content_text = '\n'.join(content)
-        
         # Special handling for different sections
         if section in ["CONTACT", "CONTACT INFORMATION"]:
-            structured_data["contact"] = extract_contact_info(content_text)
+            structured_data["contact"] = extract_contact_info(content)
         elif section in ["SKILLS", "TECHNICAL SKILLS", "SOFT SKILLS"]:
-            structured_data["skills"] = extract_skills(content_text)
+            structured_data["skills"] = extract_skills(content)
         elif section in ["EXPERIENCE", "WORK EXPERIENCE"]:
-            structured_data["experience"] = extract_experience(content_text)
+            structured_data["experience"] = extract_experience(content)
         elif section == "EDUCATION":
-            structured_data["education"] = extract_education(content_text)
+            structured_data["education"] = extract_education(content)
         elif section == "LANGUAGES":
-            structured_data["languages"] = extract_languages(content_text)
+            structured_data["languages"] = extract_languages(content)
         else:
-            structured_data[section.lower().replace(" ", "_")] = content_text
+            structured_data[section.lower().replace(" ", "_")] = '\n'.join(content)
     
     return structured_data
 
-def extract_contact_info(text):
-    """Extract contact information with enhanced patterns"""
+def extract_contact_info(lines):
+    """Extract contact information from the section's lines with enhanced patterns"""
     info = {
         "name": None,
         "email": None,
@@ -190,71 +363,82 @@ def extract_contact_info(text):
     }
     
     # Name detection (first line that looks like a name)
-    lines = [line.strip() for line in text.split('\n') if line.strip()]
     for line in lines[:5]:
         if (line.istitle() or line.isupper()) and 1 < len(line.split()) <= 4:
             info["name"] = line
             break
     
-    # Email
-    emails = re.findall(r'[\w\.-]+@[\w\.-]+\.\w+', text)
-    if emails:
-        info["email"] = emails[0]
+    # Addresses may wrap across lines, so match on the whole block
+    text = '\n'.join(lines)
     
-    # Phone (multiple formats)
-    phones = re.findall(r'(\+?\d[\d\s\-\(\)]{7,}\d)', text)
-    info["phone"] = [phone.strip() for phone in phones]
-    
-    # LinkedIn
-    linkedin = re.search(r'(linkedin\.com/[^\s]+)', text, re.I)
-    if linkedin:
-        info["linkedin"] = "https://" + linkedin.group(1)
+    # Email, phone (multiple formats) and LinkedIn
+    for match in _CONTACT_RE.finditer(text):
+        field = match.lastgroup
+        if field == "phone":
+            info["phone"].append(match.group(field).strip())
+        elif field == "email":
+            if info["email"] is None:
+                info["email"] = match.group(field)
+        elif info["linkedin"] is None:
+            info["linkedin"] = "https://" + match.group(field)
     
     # Address (simple pattern)
-    address = re.search(r'(\d{1,5}\s[\w\s]{3,},\s[\w\s]{3,},\s[A-Z]{2}\s\d{5})', text)
+    address = _ADDRESS_RE.search(text)
     if address:
         info["address"] = address.group(1)
     
     return info
 
-def extract_skills(text):
-    """Extract skills from skills section"""
-    skills = []
+def extract_skills(lines):
+    """Extract skills from the skills section's lines"""
+    # Keyed by lower-cased name so "python" and "Python" are listed once
+    skills = {}
     
-    # Split by commas, bullets, or newlines
-    items = re.split(r'[,•\n]', text)
+    # Split by commas or bullets
+    items = (item for line in lines for item in _SECTION_SPLIT_RE.split(line))
     
     for item in items:
         item = item.strip()
-        if item and len(item.split()) <= 5:  # Skip long paragraphs
-            skills.append(item)
-    
-    return skills
+        if not item:
+            continue
+        
+        # A whole item naming a known skill, or unambiguous skills inside a phrase
+        if item.lower() in _SKILL_NAMES:
+            hits = [_SKILL_NAMES[item.lower()]]
+        else:
+            hits = [_SKILL_NAMES[match.group(0).lower()] for match in _SKILLS_RE.finditer(item)]
+        
+        if hits:
+            for skill in hits:
+                skills.setdefault(skill.lower(), skill)
+        elif len(item.split()) <= 5:  # Keep unknown skills, skip long paragraphs
+            skills.setdefault(item.lower(), item)
+    
+    # First-appearance order: CVs tend to list their strongest skills first
+    return list(skills.values())
 
-def extract_experience(text):
-    """Extract structured experience data"""
+def extract_experience(lines):
+    """Extract structured experience data from the section's lines"""
     experiences = []
     current_exp = {}
     
-    lines = [line.strip() for line in text.split('\n') if line.strip()]
-    
     for line in lines:
         # Detect job title pattern
-        if re.match(r'^[A-Z][a-z]+( [A-Z][a-z]+)*$', line) and len(line.split()) <= 5:
+        if _TITLE_RE.match(line) and len(line.split()) <= 5:
             if current_exp:  # Save previous experience
                 experiences.append(current_exp)
                 current_exp = {}
             current_exp["title"] = line
         
         # Detect company and date pattern
-        elif re.match(r'^[A-Z][a-zA-Z0-9& ]+,\s[A-Z][a-z]+\s\d{4}\s?[-–—]\s?(\w+\s\d{4}|Present)', line):
-            parts = re.split(r',\s|\s[-–—]\s', line)
+        elif _COMPANY_DATE_RE.match(line):
+            parts = _SPLIT_RE.split(line)
             if len(parts) >= 3:
                 current_exp["company"] = parts[0]
                 current_exp["date"] = ' '.join(parts[1:])
         
         # Bullet points (responsibilities)
-        elif line.startswith('- ') or re.match(r'^•\s', line):
+        elif line.startswith('- ') or _BULLET_RE.match(line):
             if "responsibilities" not in current_exp:
                 current_exp["responsibilities"] = []
             current_exp["responsibilities"].append(line[2:].strip())
@@ -264,21 +448,81 @@ def extract_experience(text):
     
     return experiences
 
+def file_digest(file_path):
+    """SHA-1 of a file's contents, used as the parse cache key"""
+    digest = hashlib.sha1()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def _cache_path(digest, file_ext):
+    return os.path.join(CACHE_DIR, f"v{CACHE_VERSION}-{digest}{file_ext}.json")
+
+@lru_cache(maxsize=128)
+def _load_cached_result(digest, file_ext):
+    """Load a parsed CV from the on-disk cache (raises OSError on a miss)"""
+    with open(_cache_path(digest, file_ext), encoding='utf-8') as f:
+        return json.load(f)
+
+def _get_cached_result(digest, file_ext):
+    """Return a copy of a previously parsed CV, or None if it was never parsed"""
+    try:
+        return copy.deepcopy(_load_cached_result(digest, file_ext))
+    except (OSError, ValueError):
+        return None
+
+def _store_cached_result(digest, file_ext, structured_data):
+    """Save a parsed CV to the on-disk cache; a failed write only costs a future cache miss"""
+    try:
+        os.makedirs(CACHE_DIR, mode=0o700, exist_ok=True)
+        # Write to a private (0600) temp file and rename it so readers never see a partial entry
+        fd, tmp_path = tempfile.mkstemp(dir=CACHE_DIR, suffix='.tmp')
+    except OSError:
+        return
+    
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(structured_data, f, ensure_ascii=False)
+        os.replace(tmp_path, _cache_path(digest, file_ext))
+    except (OSError, TypeError, ValueError):
+        with contextlib.suppress(OSError):
+            os.remove(tmp_path)
+        return
+    
+    _prune_cache()
+
+def _prune_cache():
+    """Remove the oldest cache entries beyond CACHE_MAX_ENTRIES"""
+    try:
+        entries = [entry for entry in os.scandir(CACHE_DIR) if entry.name.endswith('.json')]
+        entries.sort(key=lambda entry: entry.stat().st_mtime, reverse=True)
+        for entry in entries[CACHE_MAX_ENTRIES:]:
+            os.remove(entry.path)
+    except OSError:
+        pass
+
 def process_file(file_path):
     """Process any supported file type"""
     if not os.path.exists(file_path):
         return {"error": "File not found"}
     
     file_ext = os.path.splitext(file_path)[1].lower()
+    if file_ext not in ('.pdf', '.png', '.jpg', '.jpeg'):
+        return {"error": "Unsupported file type"}
     
     try:
+        # Identical files (e.g. re-uploaded CVs) are only parsed once
+        digest = file_digest(file_path)
+        cached = _get_cached_result(digest, file_ext)
+        if cached is not None:
+            return cached
+        
         # Extract text based on file type
         if file_ext == '.pdf':
             text = extract_text_from_pdf(file_path)
-        elif file_ext in ('.png', '.jpg', '.jpeg'):
-            text = extract_text_from_image_file(file_path)
         else:
-            return {"error": "Unsupported file type"}
+            text = extract_text_from_image_file(file_path)
         
         if not text.strip():
             return {"error": "No text could be extracted"}
@@ -287,6 +531,7 @@ def process_file(file_path):
         sections = identify_sections(text)
         structured_data = extract_structured_data(sections)
         
+        _store_cached_result(digest, file_ext, structured_data)
         return structured_data
     
     except Exception as e: